@@ -4,8 +4,11 @@ Lookup audio metadata from Discogs API.
 
 Finds the earliest release for accurate year, plus genre, style, and label.
 
-Requires: pip install requests
+Requires: pip install "httpx[http2]" aiolimiter
 Optional: Set DISCOGS_TOKEN environment variable for higher rate limits
+Optional: Set DISCOGS_CACHE to change the response cache location
+Optional: pip install orjson for faster JSON parsing
+Optional: pip install ijson to stream release documents
 
 Usage:
     python discogs_lookup.py "Pink Floyd" "Comfortably Numb"
@@ -13,22 +16,92 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
+import dbm
+import hashlib
 import json
 import os
+import random
+import shelve
 import sys
-import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
-from urllib.parse import quote
+from functools import wraps
+from pathlib import Path
 
 try:
-    import requests
+    import httpx
 except ImportError:
-    print("Error: requests not installed. Run: pip install requests")
+    print('Error: httpx not installed. Run: pip install "httpx[http2]"')
     sys.exit(1)
 
+# HTTP/2 needs the h2 package; fall back to pooled HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    print("Error: aiolimiter not installed. Run: pip install aiolimiter")
+    sys.exit(1)
+
+# Optional streaming JSON support
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional faster JSON support
+try:
+    import orjson
+    
+    def json_loads(data: bytes):
+        return orjson.loads(data)
+    
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def json_loads(data: bytes):
+        return json.loads(data)
+    
+    def json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
+
 DISCOGS_API = "https://api.discogs.com"
 USER_AGENT = "AudioTaggerSkill/1.0"
 
+# Discogs allows 60 requests per minute; one limiter per event loop is shared
+# by every outbound request (AsyncLimiter must not be reused across loops)
+_limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+CACHE_PATH = Path(os.environ.get("DISCOGS_CACHE",
+                                 Path.home() / ".cache" / "audio-tagger" / "discogs"))
+MEMORY_CACHE_SIZE = 4096
+
+# Number of candidate releases whose details are fetched concurrently
+VERIFY_BATCH_SIZE = 8
+
+# Skip verification when this many of the earliest candidates share a master release
+MASTER_TOP_K = 5
+MASTER_MIN_SHARED = 2
+
+# Parts of a release document used for tagging: ijson prefix -> (field, key)
+RELEASE_FIELDS = {
+    "genres.item": ("genres", None),
+    "styles.item": ("styles", None),
+    "labels.item.name": ("labels", "name"),
+    "tracklist.item.title": ("tracklist", "title"),
+}
+
+# Transient HTTP statuses retried with exponential backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 5
+
 
 @dataclass
 class DiscogsResult:
@@ -44,70 +117,333 @@ class DiscogsResult:
     country: str | None
 
 
-def search_discogs(artist: str, title: str, token: str | None = None) -> list[dict]:
-    """Search Discogs for releases matching artist and title."""
+def _open_disk_cache() -> shelve.Shelf | None:
+    """Open the persistent response cache, or return None if it is unusable."""
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        cache = shelve.open(str(CACHE_PATH))
+    except (OSError, dbm.error):
+        return None
+    atexit.register(cache.close)
+    return cache
+
+
+def cached(func):
+    """
+    Cache decoded JSON responses of an async fetcher, keyed by URL and params.
+    
+    Recently used entries are kept in memory; all entries persist on disk across runs.
+    Concurrent misses on the same key share one in-flight request, which is
+    cancelled once every caller waiting on it has been cancelled. Failed requests
+    raise, so non-2xx responses are never cached.
+    """
+    memory: OrderedDict[str, object] = OrderedDict()
+    inflight: dict[str, list] = {}  # key -> [task, number of waiters]
+    disk = None
+    disk_opened = False
+    
+    def remember(key: str, data) -> None:
+        memory[key] = data
+        if len(memory) > MEMORY_CACHE_SIZE:
+            memory.popitem(last=False)
+    
+    async def fetch(key: str, client, url: str, params: dict | None, reader):
+        data = await func(client, url, params, reader)
+        if disk is not None:
+            disk[key] = data
+        remember(key, data)
+        return data
+    
+    def forget(key: str, task: asyncio.Task) -> None:
+        if key in inflight and inflight[key][0] is task:
+            del inflight[key]
+    
+    def finished(key: str, task: asyncio.Task) -> None:
+        forget(key, task)
+        # Mark the error as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    @wraps(func)
+    async def wrapper(client, url: str, params: dict | None = None, reader=None):
+        nonlocal disk, disk_opened
+        key = hashlib.blake2b(repr((url, sorted((params or {}).items()))).encode()).hexdigest()
+        
+        if key in memory:
+            memory.move_to_end(key)
+            return memory[key]
+        
+        if not disk_opened:
+            disk = _open_disk_cache()
+            disk_opened = True
+        
+        if disk is not None and key in disk:
+            data = disk[key]
+            remember(key, data)
+            return data
+        
+        entry = inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(fetch(key, client, url, params, reader))
+            task.add_done_callback(lambda t: finished(key, t))
+            entry = inflight[key] = [task, 0]
+        task = entry[0]
+        
+        # Shield so one cancelled waiter doesn't abort the fetch for the others,
+        # but stop the request when the last waiter goes away
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+                forget(key, task)
+            raise
+        finally:
+            entry[1] -= 1
+    
+    return wrapper
+
+
+class _ByteStreamReader:
+    """Adapt an httpx byte stream to the async read() interface ijson expects."""
+    
+    def __init__(self, response: httpx.Response):
+        self.chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0)
+        if size == 0:
+            return b""
+        return await anext(self.chunks, b"")
+
+
+async def read_json(response: httpx.Response):
+    """Read and decode a whole JSON response body."""
+    return json_loads(await response.aread())
+
+
+async def read_release(response: httpx.Response) -> dict:
+    """
+    Stream a release document, keeping only the fields in RELEASE_FIELDS.
+    
+    Parsing stops once all of them have been read; the rest of the body is drained
+    unparsed so an HTTP/1.1 connection can go back to the pool. Falls back to a full parse
+    when ijson is not installed.
+    """
+    if ijson is None:
+        return await read_json(response)
+    
+    stream = _ByteStreamReader(response)
+    release = {"genres": [], "styles": [], "labels": [], "tracklist": []}
+    remaining = set(release)
+    async for prefix, event, value in ijson.parse_async(stream):
+        if event == "string" and prefix in RELEASE_FIELDS:
+            field, key = RELEASE_FIELDS[prefix]
+            release[field].append({key: value} if key else value)
+        elif event == "end_array" and prefix in remaining:
+            remaining.discard(prefix)
+            if not remaining:
+                break
+    
+    async for _ in stream.chunks:
+        pass
+    return release
+
+
+def get_limiter() -> AsyncLimiter:
+    """Return the request rate limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = AsyncLimiter(60, 60)
+    return limiter
+
+
+@cached
+async def fetch_json(client: httpx.AsyncClient, url: str, params: dict | None = None,
+                     reader=None):
+    """
+    GET a Discogs API path and return the decoded JSON body.
+    
+    reader decodes the response (default: read_json). Rate-limit (429) and server
+    errors are retried with exponential backoff and jitter, waiting at least as
+    long as the Retry-After header asks.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        async with get_limiter(), client.stream("GET", url, params=params) as response:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+                response.raise_for_status()
+                return await (reader or read_json)(response)
+            retry_after = response.headers.get("Retry-After", "")
+        
+        delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        await asyncio.sleep(delay)
+
+
+def create_client(token: str | None = None) -> httpx.AsyncClient:
+    """
+    Create the HTTP client shared by all Discogs lookups in a run.
+    
+    With HTTP/2, concurrent requests are multiplexed over a single TCP+TLS
+    connection to api.discogs.com; otherwise connections are pooled and kept alive.
+    """
     headers = {"User-Agent": USER_AGENT}
     if token:
         headers["Authorization"] = f"Discogs token={token}"
-    
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        base_url=DISCOGS_API,
+        headers=headers,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        timeout=10,
+    )
+
+
+async def search_discogs(client: httpx.AsyncClient, artist: str, title: str) -> list[dict]:
+    """Search Discogs for releases matching artist and title."""
     # Search for track title by artist
     query = f"{artist} {title}"
-    url = f"{DISCOGS_API}/database/search"
+    url = "/database/search"
     params = {
         "q": query,
         "type": "release",
         "per_page": 50,  # Get more results to find earliest
     }
     
-    response = requests.get(url, headers=headers, params=params, timeout=10)
-    response.raise_for_status()
-    
-    return response.json().get("results", [])
+    data = await fetch_json(client, url, params)
+    return data.get("results", [])
 
 
-def get_release_details(release_id: int, token: str | None = None) -> dict:
-    """Get full release details including tracklist."""
-    headers = {"User-Agent": USER_AGENT}
-    if token:
-        headers["Authorization"] = f"Discogs token={token}"
-    
-    url = f"{DISCOGS_API}/releases/{release_id}"
-    response = requests.get(url, headers=headers, timeout=10)
-    response.raise_for_status()
-    
-    return response.json()
+async def get_release_details(client: httpx.AsyncClient, release_id: int) -> dict:
+    """Get the release fields used for tagging (genres, styles, labels, tracklist)."""
+    url = f"/releases/{release_id}"
+    return await fetch_json(client, url, reader=read_release)
 
 
-def track_on_release(release_details: dict, title: str) -> bool:
-    """Check if the track appears on this release."""
-    title_lower = title.lower()
-    for track in release_details.get("tracklist", []):
-        track_title = track.get("title", "").lower()
-        # Fuzzy match: check if title is contained or vice versa
+def track_on_release(release_details: dict, title_lower: str) -> bool:
+    """Check if the track (given as a lowercased title) appears on this release."""
+    titles = [track.get("title", "").lower() for track in release_details.get("tracklist", [])]
+    if title_lower in set(titles):
+        return True
+    # Fuzzy match: check if title is contained or vice versa
+    for track_title in titles:
         if title_lower in track_title or track_title in title_lower:
             return True
     return False
 
 
-def find_earliest_release(
+def first_or_none(seq):
+    """Return the first item of a possibly empty or missing sequence."""
+    return seq[0] if seq else None
+
+
+def build_result(artist: str, title: str, candidate: dict,
+                 details: dict | None = None) -> DiscogsResult:
+    """
+    Build a DiscogsResult from a search hit.
+    Genres, styles and label come from the full release details when available.
+    """
+    release_id = candidate.get("id")
+    if details is not None:
+        genres = details.get("genres", [])
+        styles = details.get("styles", [])
+        first_label = first_or_none(details.get("labels"))
+        label = first_label.get("name") if first_label else None
+    else:
+        genres = candidate.get("genre", [])
+        styles = candidate.get("style", [])
+        label = first_or_none(candidate.get("label"))
+    
+    return DiscogsResult(
+        artist=artist,
+        title=title,
+        year=candidate.get("year"),
+        genres=genres,
+        styles=styles,
+        label=label,
+        release_id=release_id,
+        release_url=f"https://www.discogs.com/release/{release_id}",
+        format=first_or_none(candidate.get("format")),
+        country=candidate.get("country"),
+    )
+
+
+def shares_master(candidates: list[dict]) -> bool:
+    """
+    Check whether the earliest candidate's master release is shared by others near the top.
+    If so, the search hits are pressings of the same record and need no tracklist check.
+    """
+    master_id = candidates[0].get("master_id") if candidates else None
+    if not master_id:
+        return False
+    shared = sum(1 for c in candidates[:MASTER_TOP_K] if c.get("master_id") == master_id)
+    return shared >= MASTER_MIN_SHARED
+
+
+async def earliest_verified(client: httpx.AsyncClient, batch: list[dict],
+                            title_lower: str) -> tuple[dict, dict] | None:
+    """
+    Fetch details for a year-sorted batch of candidates concurrently.
+    
+    Returns (candidate, details) for the first candidate whose tracklist contains
+    the track, or None. As soon as a candidate verifies, fetches for candidates
+    after it are cancelled since they can no longer win. Cancelling stops the
+    HTTP request (or its wait for the rate limiter) unless another lookup is
+    waiting on the same release (see cached()).
+    """
+    tasks = {
+        asyncio.ensure_future(get_release_details(client, c["id"])): i
+        for i, c in enumerate(batch)
+    }
+    pending = set(tasks)
+    best, best_details = None, None  # earliest verified candidate so far
+    
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = tasks[task]
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                if (best is None or i < best) and track_on_release(task.result(), title_lower):
+                    best, best_details = i, task.result()
+            
+            if best is not None:
+                for task in [t for t in pending if tasks[t] > best]:
+                    task.cancel()
+                    pending.discard(task)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    if best is None:
+        return None
+    return batch[best], best_details
+
+
+async def find_earliest_release_async(
+    client: httpx.AsyncClient,
     artist: str, 
     title: str, 
-    token: str | None = None,
     verify_tracklist: bool = True
 ) -> DiscogsResult | None:
     """
     Find the earliest release containing this track.
     
     Args:
+        client: Shared client from create_client()
         artist: Artist name
         title: Track title
-        token: Discogs API token (optional, for higher rate limits)
         verify_tracklist: If True, verify track appears in tracklist (slower but more accurate)
     
     Returns:
         DiscogsResult with earliest release info, or None if not found
     """
-    results = search_discogs(artist, title, token)
+    results = await search_discogs(client, artist, title)
     
     if not results:
         return None
@@ -121,68 +457,41 @@ def find_earliest_release(
     
     # Sort by year ascending (earliest first)
     candidates.sort(key=lambda x: x.get("year", 9999))
+    title_lower = title.lower()
     
-    # Find earliest release that actually contains the track
-    for candidate in candidates:
-        release_id = candidate.get("id")
-        
-        if verify_tracklist and release_id:
-            try:
-                details = get_release_details(release_id, token)
-                time.sleep(0.5)  # Rate limiting
-                
-                if not track_on_release(details, title):
-                    continue
-                
-                # Found a verified match
-                return DiscogsResult(
-                    artist=artist,
-                    title=title,
-                    year=candidate.get("year"),
-                    genres=details.get("genres", []),
-                    styles=details.get("styles", []),
-                    label=details.get("labels", [{}])[0].get("name") if details.get("labels") else None,
-                    release_id=release_id,
-                    release_url=f"https://www.discogs.com/release/{release_id}",
-                    format=candidate.get("format", [""])[0] if candidate.get("format") else None,
-                    country=candidate.get("country"),
-                )
-            except Exception:
-                continue
-        else:
-            # Skip verification, use search result directly
-            return DiscogsResult(
-                artist=artist,
-                title=title,
-                year=candidate.get("year"),
-                genres=candidate.get("genre", []),
-                styles=candidate.get("style", []),
-                label=candidate.get("label", [""])[0] if candidate.get("label") else None,
-                release_id=release_id,
-                release_url=f"https://www.discogs.com/release/{release_id}",
-                format=candidate.get("format", [""])[0] if candidate.get("format") else None,
-                country=candidate.get("country"),
-            )
-    
-    # Fallback: return first result without verification
+    # Find earliest release that actually contains the track, fetching
+    # release details for a batch of candidates concurrently. Skipped when the
+    # earliest hits cluster under one master release.
+    if verify_tracklist and not shares_master(candidates):
+        for start in range(0, len(candidates), VERIFY_BATCH_SIZE):
+            batch = [c for c in candidates[start:start + VERIFY_BATCH_SIZE] if c.get("id")]
+            match = await earliest_verified(client, batch, title_lower)
+            
+            if match:
+                candidate, details = match
+                return build_result(artist, title, candidate, details)
+    
+    # Fallback (or verification skipped): return first result without verification
     if candidates:
-        c = candidates[0]
-        return DiscogsResult(
-            artist=artist,
-            title=title,
-            year=c.get("year"),
-            genres=c.get("genre", []),
-            styles=c.get("style", []),
-            label=c.get("label", [""])[0] if c.get("label") else None,
-            release_id=c.get("id"),
-            release_url=f"https://www.discogs.com/release/{c.get('id')}",
-            format=c.get("format", [""])[0] if c.get("format") else None,
-            country=c.get("country"),
-        )
+        return build_result(artist, title, candidates[0])
     
     return None
 
 
+def find_earliest_release(
+    artist: str,
+    title: str,
+    token: str | None = None,
+    verify_tracklist: bool = True
+) -> DiscogsResult | None:
+    """Blocking wrapper around find_earliest_release_async for one-off lookups."""
+    async def run():
+        async with create_client(token) as client:
+            return await find_earliest_release_async(client, artist, title, verify_tracklist)
+    
+    return asyncio.run(run())
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Lookup track metadata from Discogs (finds earliest release)"
@@ -210,7 +519,7 @@ def main():
         sys.exit(1)
     
     if args.json:
-        print(json.dumps({
+        print(json_dumps({
             "artist": result.artist,
             "title": result.title,
             "year": result.year,
@@ -221,7 +530,7 @@ def main():
             "country": result.country,
             "release_id": result.release_id,
             "release_url": result.release_url,
-        }, indent=2))
+        }))
     else:
         print(f"Artist:  {result.artist}")
         print(f"Title:   {result.title}")
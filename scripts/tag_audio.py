@@ -4,10 +4,10 @@ Tag audio files with artist and title extracted from filename.
 Optionally enrich with Discogs metadata (year, genre, style, label).
 
 Supports: MP3 (ID3), FLAC, OGG, M4A/MP4, WMA, WAV
-Requires: pip install mutagen requests
+Requires: pip install mutagen "httpx[http2]" aiolimiter
 
 Usage:
-    python tag_audio.py <file_or_directory> [--pattern PATTERN] [--dry-run] [--recursive]
+    python tag_audio.py <file_or_directory> [--pattern PATTERN] [--dry-run] [--recursive] [--sort]
     python tag_audio.py <file_or_directory> --discogs  # Fetch from Discogs
 
 Patterns use {artist} and {title} placeholders:
@@ -18,48 +18,60 @@ Patterns use {artist} and {title} placeholders:
 """
 
 import argparse
+import asyncio
 import os
 import re
 import sys
-import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+# Format-specific mutagen modules are imported lazily by get_tagger()
 try:
     import mutagen
-    from mutagen.easyid3 import EasyID3
-    from mutagen.id3 import ID3, TIT2, TPE1, TDRC, TCON, TPUB, ID3NoHeaderError
-    from mutagen.flac import FLAC
-    from mutagen.oggvorbis import OggVorbis
-    from mutagen.mp4 import MP4
-    from mutagen.asf import ASF
-    from mutagen.wave import WAVE
 except ImportError:
     print("Error: mutagen not installed. Run: pip install mutagen")
     sys.exit(1)
 
 # Optional Discogs support
 try:
-    from discogs_lookup import find_earliest_release, DiscogsResult
+    from discogs_lookup import find_earliest_release_async, create_client, DiscogsResult
     DISCOGS_AVAILABLE = True
 except ImportError:
     DISCOGS_AVAILABLE = False
 
-SUPPORTED_EXTENSIONS = {'.mp3', '.flac', '.ogg', '.m4a', '.mp4', '.wma', '.wav'}
+SUPPORTED_EXTENSIONS = frozenset({'.mp3', '.flac', '.ogg', '.m4a', '.mp4', '.wma', '.wav'})
+
+# Maximum number of Discogs lookups in flight at once
+DISCOGS_CONCURRENCY = 8
 
+# Number of result lines buffered before writing to stdout
+OUTPUT_BATCH = 256
 
-def parse_filename(filename: str, pattern: str) -> dict[str, str] | None:
+# Worker threads for local tag writes (I/O-bound, mutagen releases the GIL on syscalls)
+TAG_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> re.Pattern:
     """
-    Parse artist and title from filename using pattern.
-    Returns dict with 'artist' and 'title' keys, or None if no match.
+    Compile a filename pattern with {artist}/{title} placeholders into a regex.
+    Memoised, so each pattern is only built once per run.
     """
-    # Remove extension
-    stem = Path(filename).stem
-    
     # Escape regex special chars in pattern, then replace placeholders
     escaped = re.escape(pattern)
     regex = escaped.replace(r'\{artist\}', r'(?P<artist>.+?)').replace(r'\{title\}', r'(?P<title>.+)')
-    
-    match = re.match(f'^{regex}$', stem, re.IGNORECASE)
+    return re.compile(f'^{regex}$', re.IGNORECASE)
+
+
+def parse_filename(stem: str, pattern: re.Pattern) -> dict[str, str] | None:
+    """
+    Parse artist and title from a filename stem (no extension) using a pattern
+    from compile_pattern().
+    Returns dict with 'artist' and 'title' keys, or None if no match.
+    """
+    match = pattern.match(stem)
     if match:
         return {
             'artist': match.group('artist').strip(),
@@ -68,124 +80,297 @@ def parse_filename(filename: str, pattern: str) -> dict[str, str] | None:
     return None
 
 
-def tag_mp3(filepath: Path, artist: str, title: str, year: int = None, 
-            genre: str = None, label: str = None) -> None:
-    """Tag MP3 file with ID3v2."""
-    try:
-        audio = ID3(filepath)
-    except ID3NoHeaderError:
-        audio = ID3()
-    
-    audio['TPE1'] = TPE1(encoding=3, text=artist)
-    audio['TIT2'] = TIT2(encoding=3, text=title)
-    if year:
-        audio['TDRC'] = TDRC(encoding=3, text=str(year))
-    if genre:
-        audio['TCON'] = TCON(encoding=3, text=genre)
-    if label:
-        audio['TPUB'] = TPUB(encoding=3, text=label)
-    audio.save(filepath)
-
-
-def tag_flac(filepath: Path, artist: str, title: str, year: int = None,
-             genre: str = None, label: str = None) -> None:
-    """Tag FLAC file with Vorbis comments."""
-    audio = FLAC(filepath)
-    audio['artist'] = artist
-    audio['title'] = title
-    if year:
-        audio['date'] = str(year)
-    if genre:
-        audio['genre'] = genre
-    if label:
-        audio['label'] = label
-    audio.save()
-
-
-def tag_ogg(filepath: Path, artist: str, title: str, year: int = None,
-            genre: str = None, label: str = None) -> None:
-    """Tag OGG file with Vorbis comments."""
-    audio = OggVorbis(filepath)
-    audio['artist'] = artist
-    audio['title'] = title
-    if year:
-        audio['date'] = str(year)
-    if genre:
-        audio['genre'] = genre
-    if label:
-        audio['label'] = label
-    audio.save()
-
-
-def tag_m4a(filepath: Path, artist: str, title: str, year: int = None,
-            genre: str = None, label: str = None) -> None:
-    """Tag M4A/MP4 file."""
-    audio = MP4(filepath)
-    audio['\xa9ART'] = [artist]
-    audio['\xa9nam'] = [title]
-    if year:
-        audio['\xa9day'] = [str(year)]
-    if genre:
-        audio['\xa9gen'] = [genre]
-    # Note: MP4 doesn't have a standard label field
-    audio.save()
-
-
-def tag_wma(filepath: Path, artist: str, title: str, year: int = None,
-            genre: str = None, label: str = None) -> None:
-    """Tag WMA file."""
-    audio = ASF(filepath)
-    audio['Author'] = [artist]
-    audio['Title'] = [title]
-    if year:
-        audio['WM/Year'] = [str(year)]
-    if genre:
-        audio['WM/Genre'] = [genre]
-    if label:
-        audio['WM/Publisher'] = [label]
-    audio.save()
-
-
-def tag_wav(filepath: Path, artist: str, title: str, year: int = None,
-            genre: str = None, label: str = None) -> None:
-    """Tag WAV file with ID3."""
-    audio = WAVE(filepath)
-    if audio.tags is None:
-        audio.add_tags()
-    audio.tags['TPE1'] = TPE1(encoding=3, text=artist)
-    audio.tags['TIT2'] = TIT2(encoding=3, text=title)
-    if year:
-        audio.tags['TDRC'] = TDRC(encoding=3, text=str(year))
-    if genre:
-        audio.tags['TCON'] = TCON(encoding=3, text=genre)
-    if label:
-        audio.tags['TPUB'] = TPUB(encoding=3, text=label)
-    audio.save()
-
-
-TAGGERS = {
-    '.mp3': tag_mp3,
-    '.flac': tag_flac,
-    '.ogg': tag_ogg,
-    '.m4a': tag_m4a,
-    '.mp4': tag_m4a,
-    '.wma': tag_wma,
-    '.wav': tag_wav,
+def _mp3_handlers():
+    from mutagen.easyid3 import EasyID3
+    from mutagen.id3 import ID3NoHeaderError
+    
+    def tag_mp3(filepath: Path, artist: str, title: str, year: int = None, 
+                genre: str = None, label: str = None) -> None:
+        """Tag MP3 file with ID3v2 (via EasyID3: TPE1, TIT2, TDRC, TCON, TPUB)."""
+        try:
+            audio = EasyID3(filepath)
+        except ID3NoHeaderError:
+            audio = EasyID3()
+        
+        audio['artist'] = artist
+        audio['title'] = title
+        if year:
+            audio['date'] = str(year)
+        if genre:
+            audio['genre'] = genre
+        if label:
+            audio['organization'] = label
+        audio.save(filepath)
+    
+    def read_mp3(filepath: Path) -> dict[str, list[str]]:
+        """Read current MP3 tag values."""
+        try:
+            audio = EasyID3(filepath)
+        except ID3NoHeaderError:
+            audio = {}
+        return {field: audio.get(key, []) for field, key in (
+            ('artist', 'artist'), ('title', 'title'), ('date', 'date'),
+            ('genre', 'genre'), ('label', 'organization'))}
+    
+    return tag_mp3, read_mp3
+
+
+def _flac_handlers():
+    from mutagen.flac import FLAC
+    
+    def tag_flac(filepath: Path, artist: str, title: str, year: int = None,
+                 genre: str = None, label: str = None) -> None:
+        """Tag FLAC file with Vorbis comments."""
+        audio = FLAC(filepath)
+        audio['artist'] = artist
+        audio['title'] = title
+        if year:
+            audio['date'] = str(year)
+        if genre:
+            audio['genre'] = genre
+        if label:
+            audio['label'] = label
+        audio.save()
+    
+    def read_flac(filepath: Path) -> dict[str, list[str]]:
+        """Read current FLAC Vorbis comments."""
+        audio = FLAC(filepath)
+        return {field: audio.get(field, []) for field in ('artist', 'title', 'date', 'genre', 'label')}
+    
+    return tag_flac, read_flac
+
+
+def _ogg_handlers():
+    from mutagen.oggvorbis import OggVorbis
+    
+    def tag_ogg(filepath: Path, artist: str, title: str, year: int = None,
+                genre: str = None, label: str = None) -> None:
+        """Tag OGG file with Vorbis comments."""
+        audio = OggVorbis(filepath)
+        audio['artist'] = artist
+        audio['title'] = title
+        if year:
+            audio['date'] = str(year)
+        if genre:
+            audio['genre'] = genre
+        if label:
+            audio['label'] = label
+        audio.save()
+    
+    def read_ogg(filepath: Path) -> dict[str, list[str]]:
+        """Read current OGG Vorbis comments."""
+        audio = OggVorbis(filepath)
+        return {field: audio.get(field, []) for field in ('artist', 'title', 'date', 'genre', 'label')}
+    
+    return tag_ogg, read_ogg
+
+
+def _m4a_handlers():
+    from mutagen.mp4 import MP4
+    
+    def tag_m4a(filepath: Path, artist: str, title: str, year: int = None,
+                genre: str = None, label: str = None) -> None:
+        """Tag M4A/MP4 file."""
+        audio = MP4(filepath)
+        audio['\xa9ART'] = [artist]
+        audio['\xa9nam'] = [title]
+        if year:
+            audio['\xa9day'] = [str(year)]
+        if genre:
+            audio['\xa9gen'] = [genre]
+        # Note: MP4 doesn't have a standard label field
+        audio.save()
+    
+    def read_m4a(filepath: Path) -> dict[str, list[str]]:
+        """Read current M4A/MP4 tag values (no label field)."""
+        audio = MP4(filepath)
+        return {field: audio.get(key, []) for field, key in (
+            ('artist', '\xa9ART'), ('title', '\xa9nam'), ('date', '\xa9day'), ('genre', '\xa9gen'))}
+    
+    return tag_m4a, read_m4a
+
+
+def _wma_handlers():
+    from mutagen.asf import ASF
+    
+    def tag_wma(filepath: Path, artist: str, title: str, year: int = None,
+                genre: str = None, label: str = None) -> None:
+        """Tag WMA file."""
+        audio = ASF(filepath)
+        audio['Author'] = [artist]
+        audio['Title'] = [title]
+        if year:
+            audio['WM/Year'] = [str(year)]
+        if genre:
+            audio['WM/Genre'] = [genre]
+        if label:
+            audio['WM/Publisher'] = [label]
+        audio.save()
+    
+    def read_wma(filepath: Path) -> dict[str, list[str]]:
+        """Read current WMA tag values."""
+        audio = ASF(filepath)
+        return {field: [str(v) for v in audio.get(key, [])] for field, key in (
+            ('artist', 'Author'), ('title', 'Title'), ('date', 'WM/Year'),
+            ('genre', 'WM/Genre'), ('label', 'WM/Publisher'))}
+    
+    return tag_wma, read_wma
+
+
+def _wav_handlers():
+    from mutagen.wave import WAVE
+    from mutagen.id3 import TIT2, TPE1, TDRC, TCON, TPUB
+    
+    def tag_wav(filepath: Path, artist: str, title: str, year: int = None,
+                genre: str = None, label: str = None) -> None:
+        """Tag WAV file with ID3."""
+        audio = WAVE(filepath)
+        if audio.tags is None:
+            audio.add_tags()
+        audio.tags['TPE1'] = TPE1(encoding=3, text=artist)
+        audio.tags['TIT2'] = TIT2(encoding=3, text=title)
+        if year:
+            audio.tags['TDRC'] = TDRC(encoding=3, text=str(year))
+        if genre:
+            audio.tags['TCON'] = TCON(encoding=3, text=genre)
+        if label:
+            audio.tags['TPUB'] = TPUB(encoding=3, text=label)
+        audio.save()
+    
+    def read_wav(filepath: Path) -> dict[str, list[str]]:
+        """Read current WAV ID3 frames."""
+        tags = WAVE(filepath).tags or {}
+        return {field: [str(t) for t in tags[key].text] if key in tags else [] for field, key in (
+            ('artist', 'TPE1'), ('title', 'TIT2'), ('date', 'TDRC'),
+            ('genre', 'TCON'), ('label', 'TPUB'))}
+    
+    return tag_wav, read_wav
+
+
+_FORMAT_HANDLERS = {
+    '.mp3': _mp3_handlers,
+    '.flac': _flac_handlers,
+    '.ogg': _ogg_handlers,
+    '.m4a': _m4a_handlers,
+    '.mp4': _m4a_handlers,
+    '.wma': _wma_handlers,
+    '.wav': _wav_handlers,
 }
 
 
-def tag_file(filepath: Path, pattern: str, dry_run: bool = False,
-             use_discogs: bool = False, discogs_token: str = None) -> tuple[bool, str]:
+@lru_cache(maxsize=None)
+def _load_format(ext: str):
+    """
+    Return the (writer, reader) pair for an extension.
+    The mutagen module for the format is imported the first time it is needed.
+    """
+    return _FORMAT_HANDLERS[ext]()
+
+
+def get_tagger(ext: str):
+    """Return the tag writer for an extension."""
+    return _load_format(ext)[0]
+
+
+def get_reader(ext: str):
+    """Return the tag reader for an extension (field -> current values)."""
+    return _load_format(ext)[1]
+
+
+def needs_update(filepath: Path, ext: str, artist: str, title: str, year: int = None,
+                 genre: str = None, label: str = None) -> bool:
+    """
+    Check whether writing these values would change the file's tags.
+    Only fields that would be written and that the format stores are compared.
+    """
+    current = get_reader(ext)(filepath)
+    wanted = {'artist': artist, 'title': title, 'date': str(year) if year else None,
+              'genre': genre, 'label': label}
+    return any(value and field in current and list(current[field]) != [value]
+               for field, value in wanted.items())
+
+
+def split_name(filepath: Path) -> tuple[Path, str, str]:
+    """Return (filepath, stem, lowercased extension) for a single file."""
+    stem, ext = os.path.splitext(filepath.name)
+    return filepath, stem, ext.lower()
+
+
+def iter_audio(root: Path, recursive: bool):
+    """
+    Yield (filepath, stem, lowercased extension) for supported audio files under root.
+    Uses os.scandir so file type checks come from the cached directory entry.
+    Unreadable directories are skipped, as Path.glob does.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    name = entry.name
+                    i = name.rfind('.')
+                    ext = name[i:].lower()
+                    if i > 0 and ext in SUPPORTED_EXTENSIONS:
+                        yield Path(entry.path), name[:i], ext
+
+
+async def resolve_all(queries: list[tuple[str, str]], token: str = None) -> list:
+    """
+    Look up (artist, title) pairs on Discogs concurrently.
+    Returns results in query order: DiscogsResult, None (not found) or the raised exception.
+    """
+    sem = asyncio.Semaphore(DISCOGS_CONCURRENCY)
+    
+    async def bounded(client, artist: str, title: str):
+        async with sem:
+            return await find_earliest_release_async(client, artist, title)
+    
+    async with create_client(token) as client:
+        tasks = [bounded(client, artist, title) for artist, title in queries]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_discogs_metadata(files: list[tuple[Path, str, str]], pattern: re.Pattern,
+                           token: str = None) -> dict[Path, object]:
+    """
+    Look up Discogs metadata for all files, querying each unique (artist, title) once.
+    files holds (filepath, stem, ext) tuples as produced by iter_audio().
+    Returns dict mapping filepath to its resolve_all() result.
+    """
+    # Pass 1: collect unique case-insensitive (artist, title) keys
+    queries = {}
+    file_keys = {}
+    for filepath, stem, _ in files:
+        parsed = parse_filename(stem, pattern)
+        if parsed:
+            key = (parsed['artist'].lower(), parsed['title'].lower())
+            queries.setdefault(key, (parsed['artist'], parsed['title']))
+            file_keys[filepath] = key
+    
+    # Pass 2: resolve each key once and fan results back out to files
+    results = dict(zip(queries, asyncio.run(resolve_all(list(queries.values()), token))))
+    return {filepath: results[key] for filepath, key in file_keys.items()}
+
+
+def tag_file(filepath: Path, stem: str, ext: str, pattern: str, dry_run: bool = False,
+             use_discogs: bool = False, discogs_result=None) -> tuple[bool, str]:
     """
     Tag a single audio file.
+    stem and ext are the precomputed filename parts (see split_name), ext lowercased.
+    discogs_result is the prefetched lookup for this file (see fetch_discogs_metadata).
     Returns (success, message).
     """
-    ext = filepath.suffix.lower()
-    
     if ext not in SUPPORTED_EXTENSIONS:
         return False, f"Unsupported format: {ext}"
     
-    parsed = parse_filename(filepath.name, pattern)
+    parsed = parse_filename(stem, compile_pattern(pattern))
     if not parsed:
         return False, f"Filename doesn't match pattern '{pattern}'"
     
@@ -198,63 +383,91 @@ def tag_file(filepath: Path, pattern: str, dry_run: bool = False,
         if not DISCOGS_AVAILABLE:
             return False, "Discogs lookup not available (check discogs_lookup.py)"
         
-        try:
-            result = find_earliest_release(artist, title, token=discogs_token)
-            if result:
-                year = result.year
-                # Combine genres and styles for richer genre tag
-                all_genres = result.genres + result.styles
-                genre = ", ".join(all_genres[:3]) if all_genres else None  # Limit to 3
-                label = result.label
-                discogs_info = f" [Discogs: {year}, {genre or 'N/A'}, {label or 'N/A'}]"
-            else:
-                discogs_info = " [Discogs: not found]"
-        except Exception as e:
-            discogs_info = f" [Discogs error: {e}]"
-    
-    if dry_run:
-        return True, f"Would tag: artist='{artist}', title='{title}'{discogs_info}"
+        result = discogs_result
+        if isinstance(result, Exception):
+            discogs_info = f" [Discogs error: {result}]"
+        elif result:
+            year = result.year
+            # Combine genres and styles for richer genre tag
+            all_genres = result.genres + result.styles
+            genre = ", ".join(all_genres[:3]) if all_genres else None  # Limit to 3
+            label = result.label
+            discogs_info = f" [Discogs: {year}, {genre or 'N/A'}, {label or 'N/A'}]"
+        else:
+            discogs_info = " [Discogs: not found]"
     
     try:
-        TAGGERS[ext](filepath, artist, title, year=year, genre=genre, label=label)
+        # Checked before the dry-run return so the preview matches a real run
+        if not needs_update(filepath, ext, artist, title, year=year, genre=genre, label=label):
+            return False, f"Up to date: artist='{artist}', title='{title}'{discogs_info}"
+        if dry_run:
+            return True, f"Would tag: artist='{artist}', title='{title}'{discogs_info}"
+        get_tagger(ext)(filepath, artist, title, year=year, genre=genre, label=label)
         return True, f"Tagged: artist='{artist}', title='{title}'{discogs_info}"
     except Exception as e:
         return False, f"Error: {e}"
 
 
 def process_path(path: Path, pattern: str, dry_run: bool, recursive: bool,
-                 use_discogs: bool = False, discogs_token: str = None) -> dict:
+                 use_discogs: bool = False, discogs_token: str = None,
+                 sort: bool = False) -> dict:
     """
     Process a file or directory.
-    Returns stats dict with 'success', 'failed', 'skipped' counts.
+    Files are reported in completion order, or by path if sort is set.
+    Returns stats dict with 'success', 'failed', 'skipped' counts, plus per-file
+    details as parallel sequences 'files', 'ok' (1/0) and 'msgs'.
     """
-    stats = {'success': 0, 'failed': 0, 'skipped': 0, 'details': []}
+    stats = {'success': 0, 'failed': 0, 'skipped': 0,
+             'files': [], 'ok': array('b'), 'msgs': []}
+    regex = compile_pattern(pattern)
     
     if path.is_file():
-        files = [path]
+        files = [split_name(path)]
     else:
-        glob_pattern = '**/*' if recursive else '*'
-        files = [f for f in path.glob(glob_pattern) if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS]
+        files = iter_audio(path, recursive)
     
-    for filepath in sorted(files):
-        success, msg = tag_file(filepath, pattern, dry_run, use_discogs, discogs_token)
-        detail = {'file': str(filepath), 'success': success, 'message': msg}
-        stats['details'].append(detail)
-        
-        if success:
-            stats['success'] += 1
-            print(f"✓ {filepath.name}: {msg}")
-        else:
-            if 'Unsupported' in msg or "doesn't match" in msg:
-                stats['skipped'] += 1
-                print(f"⊘ {filepath.name}: {msg}")
+    if sort:
+        files = sorted(files)
+    
+    # Resolve all Discogs lookups up front; the semaphore provides backpressure
+    lookups = {}
+    if use_discogs and DISCOGS_AVAILABLE:
+        files = list(files)
+        lookups = fetch_discogs_metadata(files, regex, discogs_token)
+    
+    lines = []
+    
+    # Tag files in parallel; stats are only touched from this thread
+    with ThreadPoolExecutor(max_workers=TAG_WORKERS) as executor:
+        futures = {
+            executor.submit(tag_file, filepath, stem, ext, pattern, dry_run, use_discogs,
+                            lookups.get(filepath)): filepath
+            for filepath, stem, ext in files
+        }
+        for future in (futures if sort else as_completed(futures)):
+            filepath = futures[future]
+            success, msg = future.result()
+            stats['files'].append(str(filepath))
+            stats['ok'].append(1 if success else 0)
+            stats['msgs'].append(msg)
+            
+            if success:
+                stats['success'] += 1
+                lines.append(f"✓ {filepath.name}: {msg}")
             else:
-                stats['failed'] += 1
-                print(f"✗ {filepath.name}: {msg}")
-        
-        # Rate limiting for Discogs
-        if use_discogs and not dry_run:
-            time.sleep(1)
+                if 'Unsupported' in msg or "doesn't match" in msg or msg.startswith('Up to date'):
+                    stats['skipped'] += 1
+                    lines.append(f"⊘ {filepath.name}: {msg}")
+                else:
+                    stats['failed'] += 1
+                    lines.append(f"✗ {filepath.name}: {msg}")
+            
+            if len(lines) >= OUTPUT_BATCH:
+                sys.stdout.write('\n'.join(lines) + '\n')
+                lines.clear()
+    
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     return stats
 
@@ -279,6 +492,8 @@ Examples:
                         help='Show what would be done without making changes')
     parser.add_argument('--recursive', '-r', action='store_true',
                         help='Process directories recursively')
+    parser.add_argument('--sort', action='store_true',
+                        help='Process and report files in path order (default: completion order)')
     parser.add_argument('--discogs', '-d', action='store_true',
                         help='Fetch metadata from Discogs (year, genre, label)')
     parser.add_argument('--discogs-token', 
@@ -302,7 +517,7 @@ Examples:
     
     token = args.discogs_token or os.environ.get('DISCOGS_TOKEN')
     stats = process_path(args.path, args.pattern, args.dry_run, args.recursive,
-                         args.discogs, token)
+                         args.discogs, token, args.sort)
     
     print(f"\nSummary: {stats['success']} tagged, {stats['failed']} failed, {stats['skipped']} skipped")
     